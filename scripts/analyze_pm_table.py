@@ -19,8 +19,15 @@ Options:
     --cpuinfo       Compare with /proc/cpuinfo frequencies
 """
 
+import array
+import bisect
+import math
+import os
+import re
 import struct
 import argparse
+import functools
+import itertools
 import sys
 from pathlib import Path
 
@@ -29,12 +36,15 @@ PM_TABLE_PATH = f"{SYSFS_PATH}/pm_table"
 PM_VERSION_PATH = f"{SYSFS_PATH}/pm_table_version"
 CODENAME_PATH = f"{SYSFS_PATH}/codename"
 
+_UNPACK_U32 = struct.Struct('<I').unpack_from
 
-def read_pm_table():
-    """Read PM table binary data"""
+_CPU_MHZ_RE = re.compile(rb'^cpu MHz\s*:\s*(\d+(?:\.\d*)?)', re.M)
+
+
+def open_pm_table():
+    """Open PM table for repeated reads, returning a raw file descriptor"""
     try:
-        with open(PM_TABLE_PATH, 'rb') as f:
-            return f.read()
+        return os.open(PM_TABLE_PATH, os.O_RDONLY)
     except PermissionError:
         print("Error: Permission denied. Run with sudo.", file=sys.stderr)
         sys.exit(1)
@@ -43,16 +53,38 @@ def read_pm_table():
         sys.exit(1)
 
 
+def read_fd(fd):
+    """Read everything from the current position of a raw file descriptor"""
+    # sysfs hands out at most a page per read(), so loop until EOF
+    parts = []
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        parts.append(chunk)
+    return b"".join(parts)
+
+
+def read_pm_table():
+    """Read PM table binary data"""
+    fd = open_pm_table()
+    try:
+        return read_fd(fd)
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
 def read_pm_version():
     """Read PM table version as little-endian u32"""
     try:
         with open(PM_VERSION_PATH, 'rb') as f:
-            data = f.read(4)
-            return struct.unpack('<I', data)[0]
+            return _UNPACK_U32(f.read(4))[0]
     except:
         return 0
 
 
+@functools.lru_cache(maxsize=1)
 def read_codename():
     """Read processor codename"""
     try:
@@ -91,126 +123,161 @@ CODENAME_MAP = {
     25: "Storm Peak",
 }
 
-
-def read_f32(data, offset):
-    """Read little-endian float at offset"""
-    if offset + 4 > len(data):
-        return None
-    return struct.unpack('<f', data[offset:offset+4])[0]
-
-
-def dump_all(data):
+# Value ranges that hint at what a field holds, used to annotate --dump output
+LABEL_RANGES = (
+    (150, 170, " <- possible PPT limit"),
+    (200, 250, " <- possible EDC limit"),
+    (90, 100, " <- possible TDC limit"),
+    (1500, 3500, " <- possible FCLK/MCLK"),
+    (4000, 6500, " <- possible core freq"),
+)
+
+# Sorted, non-overlapping range edges: a value inside a range bisects to an
+# odd index, whose label sits at index // 2
+_LABEL_EDGES = [edge for lo, hi, _ in sorted(LABEL_RANGES) for edge in (lo, hi)]
+_LABEL_HINTS = [hint for _, _, hint in sorted(LABEL_RANGES)]
+
+_DUMP_LINE = "  0x%04X (field %3d): %12.4f%s\n"
+
+
+def unpack_floats(data):
+    """Decode every complete little-endian float in the table in one pass"""
+    end = len(data) // 4 * 4
+    floats = array.array('f')
+    floats.frombytes(memoryview(data)[:end])
+    if sys.byteorder == 'big':
+        floats.byteswap()
+    return floats
+
+
+def finite_fields(floats):
+    """Return (offset, value) for every float that is not NaN or infinite"""
+    return [(field * 4, value) for field, value in enumerate(floats) if math.isfinite(value)]
+
+
+def scan_range(fields, lo, hi):
+    """Return the (offset, value) fields strictly between lo and hi"""
+    return [(offset, value) for offset, value in fields if lo < value < hi]
+
+
+def find_core_arrays(floats, core_count):
+    """Find start fields of temperature, power and frequency array candidates
+
+    Temperature and power windows need every value in range, so they only
+    track the run of consecutive in-range values; an out-of-range value
+    resets the run and rules out every window containing it. Frequency
+    windows allow 2 cores to be idle/different and keep a running in-range
+    count instead. All three are updated in one slide over the table.
+    """
+    temp = power = freq = 0
+    for value in floats[:core_count - 1]:
+        temp = temp + 1 if 25 < value < 95 else 0
+        power = power + 1 if 0.5 < value < 20 else 0
+        freq += 400 < value < 6000
+
+    temp_bases, power_bases, freq_bases = [], [], []
+    entering = itertools.islice(floats, core_count - 1, None)
+    for start, (leaving, value) in enumerate(zip(floats, entering)):
+        temp = temp + 1 if 25 < value < 95 else 0
+        power = power + 1 if 0.5 < value < 20 else 0
+        freq += 400 < value < 6000
+        if temp >= core_count:
+            temp_bases.append(start)
+        if power >= core_count:
+            power_bases.append(start)
+        if freq >= core_count - 2:
+            freq_bases.append(start)
+        freq -= 400 < leaving < 6000
+    return temp_bases, power_bases, freq_bases
+
+
+def dump_all(data, floats):
     """Dump all float values"""
     print(f"=== PM Table Dump ({len(data)} bytes) ===\n")
-    for i in range(0, len(data), 4):
-        value = read_f32(data, i)
-        if value is not None:
-            label = ""
-            if 150 < value < 170:
-                label = " <- possible PPT limit"
-            elif 200 < value < 250:
-                label = " <- possible EDC limit"
-            elif 90 < value < 100:
-                label = " <- possible TDC limit"
-            elif 1500 < value < 3500:
-                label = " <- possible FCLK/MCLK"
-            elif 4000 < value < 6500:
-                label = " <- possible core freq"
-            print(f"  0x{i:04X} (field {i//4:3d}): {value:12.4f}{label}")
-
-
-def search_temps(data):
+    out = []
+    for field, value in enumerate(floats):
+        i = field * 4
+        label = ""
+        pos = bisect.bisect_left(_LABEL_EDGES, value)
+        if pos & 1 and value != _LABEL_EDGES[pos]:
+            label = _LABEL_HINTS[pos // 2]
+        out.append(_DUMP_LINE % (i, field, value, label))
+    sys.stdout.write("".join(out))
+
+
+def search_temps(fields):
     """Search for temperature values (30-95°C)"""
     print("=== Temperature Values (30-95°C) ===\n")
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and 30 < value < 95:
-            print(f"  0x{i:04X}: {value:7.2f}°C")
+    matches = scan_range(fields, 30, 95)
+    sys.stdout.write("".join("  0x%04X: %7.2f°C\n" % match for match in matches))
 
 
-def search_power(data):
+def search_power(fields):
     """Search for power values (5-200W)"""
     print("=== Power Values (5-200W) ===\n")
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and 5 < value < 200:
-            print(f"  0x{i:04X}: {value:7.2f}W")
+    matches = scan_range(fields, 5, 200)
+    sys.stdout.write("".join("  0x%04X: %7.2fW\n" % match for match in matches))
 
 
-def search_freq(data):
+def search_freq(fields):
     """Search for frequency values (1000-7000 MHz)"""
     print("=== Frequency Values (1000-7000 MHz) ===\n")
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and 1000 < value < 7000:
-            print(f"  0x{i:04X}: {value:7.1f} MHz")
+    matches = scan_range(fields, 1000, 7000)
+    sys.stdout.write("".join("  0x%04X: %7.1f MHz\n" % match for match in matches))
 
 
-def search_voltage(data):
+def search_voltage(fields):
     """Search for voltage values (0.5-2.0V)"""
     print("=== Voltage Values (0.5-2.0V) ===\n")
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and 0.5 < value < 2.0:
-            print(f"  0x{i:04X}: {value:7.4f}V")
+    matches = scan_range(fields, 0.5, 2.0)
+    sys.stdout.write("".join("  0x%04X: %7.4fV\n" % match for match in matches))
 
 
-def search_core_arrays(data, core_count=16):
+def search_core_arrays(floats, core_count=16):
     """Search for arrays that might be per-core data"""
     print(f"=== Searching for {core_count}-element arrays ===\n")
+    temp_bases, power_bases, freq_bases = find_core_arrays(floats, core_count)
 
     # Search for temperature arrays
     print("Per-core temperature candidates (all values 25-95°C):")
-    for base in range(0, len(data) - core_count * 4, 4):
-        values = [read_f32(data, base + i * 4) for i in range(core_count)]
-        if all(v and 25 < v < 95 for v in values):
-            avg = sum(values) / len(values)
-            if 30 < avg < 70:
-                print(f"\n  0x{base:04X}: avg={avg:.1f}°C")
-                for i, v in enumerate(values):
-                    print(f"    Core {i:2d}: {v:.1f}°C")
+    for field in temp_bases:
+        values = floats[field:field + core_count]
+        avg = sum(values) / len(values)
+        if 30 < avg < 70:
+            print(f"\n  0x{field * 4:04X}: avg={avg:.1f}°C")
+            for i, v in enumerate(values):
+                print(f"    Core {i:2d}: {v:.1f}°C")
 
     # Search for power arrays
     print("\n\nPer-core power candidates (all values 0.5-20W):")
-    for base in range(0, len(data) - core_count * 4, 4):
-        values = [read_f32(data, base + i * 4) for i in range(core_count)]
-        if all(v and 0.5 < v < 20 for v in values):
-            avg = sum(values) / len(values)
-            if 2 < avg < 15:
-                print(f"\n  0x{base:04X}: avg={avg:.1f}W")
-                for i, v in enumerate(values):
-                    print(f"    Core {i:2d}: {v:.2f}W")
+    for field in power_bases:
+        values = floats[field:field + core_count]
+        avg = sum(values) / len(values)
+        if 2 < avg < 15:
+            print(f"\n  0x{field * 4:04X}: avg={avg:.1f}W")
+            for i, v in enumerate(values):
+                print(f"    Core {i:2d}: {v:.2f}W")
 
     # Search for frequency arrays
     print("\n\nPer-core frequency candidates (most values 400-6000 MHz):")
-    for base in range(0, len(data) - core_count * 4, 4):
-        values = [read_f32(data, base + i * 4) for i in range(core_count)]
-        valid = sum(1 for v in values if v and 400 < v < 6000)
-        if valid >= core_count - 2:  # Allow 2 cores to be idle/different
-            print(f"\n  0x{base:04X}:")
-            for i, v in enumerate(values):
-                print(f"    Core {i:2d}: {v:.0f} MHz")
+    for field in freq_bases:
+        print(f"\n  0x{field * 4:04X}:")
+        for i, v in enumerate(floats[field:field + core_count]):
+            print(f"    Core {i:2d}: {v:.0f} MHz")
 
 
-def compare_cpuinfo(data):
+def compare_cpuinfo(fields):
     """Compare with /proc/cpuinfo frequencies"""
     print("=== Comparing with /proc/cpuinfo ===\n")
 
     try:
-        with open('/proc/cpuinfo', 'r') as f:
+        with open('/proc/cpuinfo', 'rb') as f:
             cpuinfo = f.read()
     except:
         print("Cannot read /proc/cpuinfo")
         return
 
-    freqs = []
-    for line in cpuinfo.split('\n'):
-        if line.startswith('cpu MHz'):
-            try:
-                freq = float(line.split(':')[1].strip())
-                freqs.append(freq)
-            except:
-                pass
+    freqs = [float(m.group(1)) for m in _CPU_MHZ_RE.finditer(cpuinfo)]
 
     if not freqs:
         print("No frequencies found in cpuinfo")
@@ -222,14 +289,11 @@ def compare_cpuinfo(data):
 
     print(f"\nSearching for matching values in PM table...")
     sample = freqs[0]
-    found = False
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and abs(value - sample) < 100:
-            print(f"  Found {value:.0f} MHz at 0x{i:04X} (matches Core 0: {sample:.0f} MHz)")
-            found = True
-
-    if not found:
+    matches = scan_range(fields, sample - 100, sample + 100)
+    for i, value in matches:
+        print(f"  Found {value:.0f} MHz at 0x{i:04X} (matches Core 0: {sample:.0f} MHz)")
+
+    if not matches:
         print("  No matching frequencies found in PM table")
         print("  (Frequencies may need to be read from /proc/cpuinfo instead)")
 
@@ -272,34 +336,36 @@ def main():
         sys.exit(0)
 
     data = read_pm_table()
+    floats = unpack_floats(data)
+    fields = finite_fields(floats)
     print_header(data)
 
     if args.dump or args.all:
-        dump_all(data)
+        dump_all(data, floats)
         print()
 
     if args.temps or args.all:
-        search_temps(data)
+        search_temps(fields)
         print()
 
     if args.power or args.all:
-        search_power(data)
+        search_power(fields)
         print()
 
     if args.freq or args.all:
-        search_freq(data)
+        search_freq(fields)
         print()
 
     if args.voltage or args.all:
-        search_voltage(data)
+        search_voltage(fields)
         print()
 
     if args.core_arrays or args.all:
-        search_core_arrays(data, args.cores)
+        search_core_arrays(floats, args.cores)
         print()
 
     if args.cpuinfo or args.all:
-        compare_cpuinfo(data)
+        compare_cpuinfo(fields)
         print()
 
 
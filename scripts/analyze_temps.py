@@ -17,8 +17,12 @@ Options:
     --watch         Continuously monitor temperatures
 """
 
+import array
+import math
+import os
 import struct
 import argparse
+import functools
 import sys
 import time
 from pathlib import Path
@@ -28,6 +32,9 @@ PM_TABLE_PATH = f"{SYSFS_PATH}/pm_table"
 PM_VERSION_PATH = f"{SYSFS_PATH}/pm_table_version"
 CODENAME_PATH = f"{SYSFS_PATH}/codename"
 
+_UNPACK_F32 = struct.Struct('<f').unpack_from
+_UNPACK_U32 = struct.Struct('<I').unpack_from
+
 CODENAME_MAP = {
     0: "Unsupported",
     1: "Colfax",
@@ -58,11 +65,10 @@ CODENAME_MAP = {
 }
 
 
-def read_pm_table():
-    """Read PM table binary data"""
+def open_pm_table():
+    """Open PM table for repeated reads, returning a raw file descriptor"""
     try:
-        with open(PM_TABLE_PATH, 'rb') as f:
-            return f.read()
+        return os.open(PM_TABLE_PATH, os.O_RDONLY)
     except PermissionError:
         print("Error: Permission denied. Run with sudo.", file=sys.stderr)
         sys.exit(1)
@@ -71,16 +77,38 @@ def read_pm_table():
         sys.exit(1)
 
 
+def read_fd(fd):
+    """Read everything from the current position of a raw file descriptor"""
+    # sysfs hands out at most a page per read(), so loop until EOF
+    parts = []
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        parts.append(chunk)
+    return b"".join(parts)
+
+
+def read_pm_table():
+    """Read PM table binary data"""
+    fd = open_pm_table()
+    try:
+        return read_fd(fd)
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
 def read_pm_version():
     """Read PM table version as little-endian u32"""
     try:
         with open(PM_VERSION_PATH, 'rb') as f:
-            data = f.read(4)
-            return struct.unpack('<I', data)[0]
+            return _UNPACK_U32(f.read(4))[0]
     except:
         return 0
 
 
+@functools.lru_cache(maxsize=1)
 def read_codename():
     """Read processor codename"""
     try:
@@ -94,7 +122,54 @@ def read_f32(data, offset):
     """Read little-endian float at offset"""
     if offset + 4 > len(data):
         return None
-    return struct.unpack('<f', data[offset:offset+4])[0]
+    return _UNPACK_F32(data, offset)[0]
+
+
+def unpack_floats(data):
+    """Decode every complete little-endian float in the table in one pass"""
+    end = len(data) // 4 * 4
+    floats = array.array('f')
+    floats.frombytes(memoryview(data)[:end])
+    if sys.byteorder == 'big':
+        floats.byteswap()
+    return floats
+
+
+def finite_fields(floats):
+    """Return (offset, value) for every float that is not NaN or infinite"""
+    return [(field * 4, value) for field, value in enumerate(floats) if math.isfinite(value)]
+
+
+def scan_range(fields, lo, hi):
+    """Return the (offset, value) fields strictly between lo and hi"""
+    return [(offset, value) for offset, value in fields if lo < value < hi]
+
+
+def window_bases(floats, size, lo, hi):
+    """Yield start fields of size-element windows with every value in range"""
+    # Track the run of consecutive in-range values ending at each field; an
+    # out-of-range value rules out every window containing it at once
+    run = 0
+    for end, value in enumerate(floats):
+        if lo < value < hi:
+            run += 1
+            if run >= size:
+                yield end - size + 1
+        else:
+            run = 0
+
+
+def read_offsets(fd, offsets):
+    """Read the floats at specific offsets from an open PM table"""
+    chunks = [os.pread(fd, 4, o) for o in offsets]
+    return [_UNPACK_F32(chunk)[0] if len(chunk) == 4 else None for chunk in chunks]
+
+
+def reread_offsets(fd, offsets):
+    """Read the floats at specific offsets by re-reading the whole table"""
+    os.lseek(fd, 0, os.SEEK_SET)
+    data = read_fd(fd)
+    return [read_f32(data, o) for o in offsets]
 
 
 def print_header():
@@ -112,15 +187,11 @@ def print_header():
     print()
 
 
-def search_tctl(data):
+def search_tctl(fields):
     """Search for Tctl/junction temperature (typically 40-95°C under load)"""
     print("=== Tctl/Junction Temperature Candidates (40-95°C) ===\n")
 
-    candidates = []
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and 40 < value < 95:
-            candidates.append((i, value))
+    candidates = scan_range(fields, 40, 95)
 
     # Sort by value (highest temps are likely Tctl)
     candidates.sort(key=lambda x: x[1], reverse=True)
@@ -132,15 +203,11 @@ def search_tctl(data):
     return candidates
 
 
-def search_soc_temp(data):
+def search_soc_temp(fields):
     """Search for SoC temperature (typically 30-70°C)"""
     print("=== SoC Temperature Candidates (30-70°C) ===\n")
 
-    candidates = []
-    for i in range(0, len(data) - 4, 4):
-        value = read_f32(data, i)
-        if value and 30 < value < 70:
-            candidates.append((i, value))
+    candidates = scan_range(fields, 30, 70)
 
     print(f"Found {len(candidates)} candidates in range 30-70°C:")
     for offset, value in candidates[:30]:
@@ -149,23 +216,21 @@ def search_soc_temp(data):
     return candidates
 
 
-def search_core_temps(data, num_cores=16):
+def search_core_temps(floats, num_cores=16):
     """Search for per-core temperature arrays"""
     print(f"=== Per-Core Temperature Array Candidates ({num_cores} cores) ===\n")
 
     candidates = []
 
-    for base in range(0, len(data) - num_cores * 4, 4):
-        values = [read_f32(data, base + i * 4) for i in range(num_cores)]
+    # Only windows where all values are in reasonable temperature range
+    for field in window_bases(floats, num_cores, 25, 100):
+        values = floats[field:field + num_cores]
+        avg = sum(values) / len(values)
+        spread = max(values) - min(values)
 
-        # Check if all values are in reasonable temperature range
-        if all(v is not None and 25 < v < 100 for v in values):
-            avg = sum(values) / len(values)
-            spread = max(values) - min(values)
-
-            # Good candidates have reasonable average and small spread
-            if 35 < avg < 85 and spread < 30:
-                candidates.append((base, values, avg, spread))
+        # Good candidates have reasonable average and small spread
+        if 35 < avg < 85 and spread < 30:
+            candidates.append((field * 4, values, avg, spread))
 
     # Sort by average temperature (descending)
     candidates.sort(key=lambda x: x[2], reverse=True)
@@ -215,24 +280,46 @@ def compare_with_sensors(data):
         print(f"  Error reading hwmon: {e}")
 
 
-def watch_temps(data_getter, offsets, interval=1.0):
+def watch_temps(offsets, interval=1.0):
     """Continuously monitor temperatures at specific offsets"""
     print("=== Temperature Monitor (Ctrl+C to stop) ===\n")
-    print("Monitoring offsets:", [f"0x{o:04X}" for o in offsets])
-    print()
 
+    # Keep the table open and only fetch the watched fields each tick
+    fd = open_pm_table()
     try:
+        size = len(read_fd(fd))
+        skipped = [o for o in offsets if o + 4 > size]
+        if skipped:
+            print(f"Warning: ignoring offsets past the end of the {size}-byte PM table:",
+                  [f"0x{o:04X}" for o in skipped], file=sys.stderr)
+        offsets = tuple(o for o in offsets if o + 4 <= size)
+        if not offsets:
+            print("Error: no --watch offsets left to monitor", file=sys.stderr)
+            sys.exit(1)
+
+        # Fall back to whole-table reads if sysfs refuses positioned reads
+        reader = read_offsets
+        try:
+            read_offsets(fd, offsets)
+        except OSError:
+            reader = reread_offsets
+
+        labels = tuple(f"0x{o:04X}" for o in offsets)
+        print("Monitoring offsets:", list(labels))
+        print()
+
         while True:
-            data = data_getter()
-            values = [read_f32(data, o) for o in offsets]
+            values = reader(fd, offsets)
 
             timestamp = time.strftime("%H:%M:%S")
-            temp_str = " | ".join(f"0x{o:04X}:{v:5.1f}°C" for o, v in zip(offsets, values) if v)
+            temp_str = " | ".join(f"{label}:{v:5.1f}°C" for label, v in zip(labels, values) if v)
             print(f"[{timestamp}] {temp_str}")
 
             time.sleep(interval)
     except KeyboardInterrupt:
         print("\nMonitoring stopped.")
+    finally:
+        os.close(fd)
 
 
 def main():
@@ -253,8 +340,14 @@ def main():
         if not args.watch:
             print("Error: --watch requires offset arguments (e.g., --watch 0x00C 0x534)")
             sys.exit(1)
-        offsets = [int(o, 16) for o in args.watch]
-        watch_temps(read_pm_table, offsets)
+        try:
+            offsets = tuple(int(o, 16) for o in args.watch)
+        except ValueError:
+            offsets = ()
+        if not offsets or min(offsets) < 0:
+            print(f"Error: --watch offsets must be non-negative hex values, got: {' '.join(args.watch)}")
+            sys.exit(1)
+        watch_temps(offsets)
         return
 
     # If no options specified, show help
@@ -268,18 +361,20 @@ def main():
 
     print_header()
     data = read_pm_table()
+    floats = unpack_floats(data)
+    fields = finite_fields(floats)
     print(f"PM Table Size: {len(data)} bytes\n")
 
     if args.tctl or args.all:
-        search_tctl(data)
+        search_tctl(fields)
         print()
 
     if args.soc or args.all:
-        search_soc_temp(data)
+        search_soc_temp(fields)
         print()
 
     if args.cores or args.all:
-        search_core_temps(data, args.num_cores)
+        search_core_temps(floats, args.num_cores)
         print()
 
     if args.compare or args.all: